@@ -25,56 +25,80 @@ class TransactionsAnalysis:
     
     def get_average_by_category(self):
         """Returns mean transaction amount grouped by category"""
-        return self.df_transactions.groupby(["accountId", "category"]) \
-                                   .agg({"transactionAmount": "mean"}) \
-                                   .unstack()
+        return self.df_transactions.pivot_table(index="accountId", columns="category", values=["transactionAmount"],
+                                                aggfunc="mean", observed=True)
 
     def rolling_window(self, window_size=5, target_total_cols=None):
         """Returns aggregate output of rolling window aggregations"""
         if target_total_cols is None:
             target_total_cols = ["AA", "CC", "FF"]
         
-        # +1 to exclude current day in range-start
+        df_daily = self.aggregate_daily(self.df_transactions, target_total_cols)
+        
+        # Each row of df_daily is one day so a fixed window of rows is a window of days. closed="left" excludes the
+        # current day, giving the same [day - window_size, day) range as before
+        df_rolling = df_daily.groupby(level="accountId") \
+                             .rolling(window_size, min_periods=1, closed="left") \
+                             .agg({col: "max" if col == "max" else "sum" for col in df_daily.columns})
+        # groupby().rolling() prepends the group key to the existing (accountId, transactionDay) index
+        df_rolling = df_rolling.droplevel(0)
+        
+        df_aggregated = self.aggregate_max_mean(df_rolling)
+        df_aggregated = self.aggregate_totals(df_rolling, df_aggregated, target_total_cols)
+        
+        # +1 to exclude current day in range-start, accounts without transactions in the window are dropped
         window_start = window_size + 1
-        # +1 to include the last day in range-end
-        window_end = self.df_transactions["transactionDay"].max() + 1
+        days = df_aggregated.index.get_level_values("transactionDay")
+        df_aggregated = df_aggregated[(days >= window_start) & df_aggregated[("transactionAmount", "mean")].notna()]
     
-        df_all_windows = pd.DataFrame()
-    
-        for num_day in range(window_start, window_end):
-            df_transaction_window = self.df_transactions[(self.df_transactions["transactionDay"] >= num_day - window_size) &
-                                                         (self.df_transactions["transactionDay"] < num_day)]
+        return self.set_new_col_index(df_aggregated)
+
+    @staticmethod
+    def aggregate_daily(df: pd.DataFrame, target_cols):
+        """
+        Returns max, sum and count of transaction amounts and the totals of the target categories, indexed by every
+        (accountId, transactionDay) pair between the first and last day
+        """
+        df_grouped = df.groupby(["accountId", "transactionDay"])["transactionAmount"]
         
-            df_aggregated = self.aggregate_max_mean(df_transaction_window)
-            df_aggregated = self.aggregate_totals(df_transaction_window, df_aggregated, target_total_cols)
-            df_all_windows = df_all_windows.append(self.set_new_col_index(df_aggregated, num_day))
-    
-        return df_all_windows
+        # A single isin() pass selects the target category rows, their totals are then pivoted to a column per category.
+        # Reindexing adds NaN columns for target categories without any transactions
+        df_target_totals = df[df["category"].isin(target_cols)] \
+            .groupby(["accountId", "transactionDay", "category"], observed=True)["transactionAmount"] \
+            .sum() \
+            .unstack("category")
+        
+        df_daily = pd.concat([df_grouped.agg(["max", "sum", "count"]),
+                              df_target_totals.reindex(columns=target_cols)], axis=1)
+        
+        days = range(df["transactionDay"].min(), df["transactionDay"].max() + 1)
+        full_index = pd.MultiIndex.from_product([df_daily.index.get_level_values("accountId").unique(), days],
+                                                names=["accountId", "transactionDay"])
+        return df_daily.reindex(full_index)
 
     @staticmethod
-    def aggregate_max_mean(df: pd.DataFrame):
-        """Returns max and mean values of transaction amount by account id"""
-        return df.groupby(["accountId"]).agg({"transactionAmount": ["max", "mean"]})
+    def aggregate_max_mean(df_rolling: pd.DataFrame):
+        """Returns max and mean values of transaction amount from the rolled daily aggregations"""
+        return pd.DataFrame({("transactionAmount", "max"): df_rolling["max"],
+                             ("transactionAmount", "mean"): df_rolling["sum"] / df_rolling["count"]})
 
     @staticmethod
-    def set_new_col_index(df, day):
-        """Returns dataframe with index reset to 'Day'"""
-        df["Day"] = day
-        return df.reset_index().set_index("Day")
+    def set_new_col_index(df):
+        """Returns dataframe indexed by 'Day' and sorted by day"""
+        df = df.rename_axis(index={"transactionDay": "Day"}) \
+               .swaplevel() \
+               .sort_index()
+        return df.reset_index(level="accountId")
 
     @staticmethod
-    def aggregate_totals(df_window, df_main, target_cols):
-        for col in target_cols:
-            df_transacs_target = df_window.loc[df_window["category"] == col]
+    def aggregate_totals(df_rolling, df_main, target_cols):
+        # Column frames are collected and concatenated once, joining each one onto df_main would copy it every time
+        frames = [df_main]
         
-            df_transacs_total = df_transacs_target.groupby(["accountId"]) \
-                .agg({"transactionAmount": "sum"}) \
-                .rename(columns={"transactionAmount": f"{col} Total Value"})
-
-            df_transacs_total.columns = pd.MultiIndex.from_product([["Total Values"], df_transacs_total.columns])
-            df_main = df_main.join(df_transacs_total)  # multi-index join
+        for col in target_cols:
+            frames.append(df_rolling[col].rename(("Total Values", f"{col} Total Value")))
     
-        return df_main
+        return pd.concat(frames, axis=1)
     
 
 if __name__ == '__main__':
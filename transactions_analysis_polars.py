@@ -0,0 +1,98 @@
+import polars as pl
+
+
+class TransactionsAnalysis:
+    """
+    Analysis class with aggregation methods that operate on a lazily scanned transactions file
+    """
+    def __init__(self, transactions_data_path):
+        self.lf_transactions = self.read_transactions_file(transactions_data_path)
+
+    @staticmethod
+    def read_transactions_file(data_path):
+        """Scans csv file into a polars LazyFrame, the file is only read when a query is collected"""
+        return pl.scan_csv(data_path, schema={"transactionId": pl.Utf8,
+                                              "accountId": pl.Utf8,
+                                              "transactionDay": pl.UInt16,
+                                              "category": pl.Categorical,
+                                              "transactionAmount": pl.Float64})
+
+    def get_daily_totals(self):
+        """Returns sum of transaction amounts grouped by day"""
+        return self.lf_transactions.group_by("transactionDay") \
+                                   .agg(pl.col("transactionAmount").sum()) \
+                                   .sort("transactionDay") \
+                                   .collect()
+
+    def get_average_by_category(self):
+        """Returns mean transaction amount grouped by category"""
+        return self.lf_transactions.group_by(["accountId", "category"]) \
+                                   .agg(pl.col("transactionAmount").mean()) \
+                                   .collect() \
+                                   .pivot(on="category", index="accountId", values="transactionAmount",
+                                          sort_columns=True) \
+                                   .sort("accountId")
+
+    def rolling_window(self, window_size=5, target_total_cols=None):
+        """Returns aggregate output of rolling window aggregations"""
+        if target_total_cols is None:
+            target_total_cols = ["AA", "CC", "FF"]
+
+        total_cols = [f"{col} Total Value" for col in target_total_cols]
+
+        lf_daily = self.aggregate_daily(self.lf_transactions, target_total_cols)
+
+        # closed="left" makes the window of each day [day - window_size, day), excluding the current day
+        lf_rolling = self.day_grid(self.lf_transactions) \
+            .join(lf_daily, on=["accountId", "transactionDay"], how="left") \
+            .sort(["accountId", "transactionDay"]) \
+            .rolling(index_column="transactionDay", period=f"{window_size}i", closed="left", group_by="accountId") \
+            .agg(pl.col("max").max(), *[pl.col(col).sum() for col in ["total", "count"] + total_cols])
+
+        # +1 to exclude current day in range-start, accounts without transactions in the window are dropped
+        window_start = window_size + 1
+
+        return lf_rolling.filter((pl.col("transactionDay") >= window_start) & (pl.col("count") > 0)) \
+                         .select(pl.col("transactionDay").alias("Day"),
+                                 pl.col("accountId").alias("Account ID"),
+                                 pl.col("max").alias("Max Transaction"),
+                                 (pl.col("total") / pl.col("count")).alias("Mean Transaction"),
+                                 *total_cols) \
+                         .sort(["Day", "Account ID"]) \
+                         .collect()
+
+    @staticmethod
+    def aggregate_daily(lf: pl.LazyFrame, target_cols):
+        """Returns max, total and count of transaction amounts and the target category totals per account and day"""
+        amount = pl.col("transactionAmount")
+
+        return lf.group_by(["accountId", "transactionDay"]) \
+                 .agg(amount.max().alias("max"),
+                      amount.sum().alias("total"),
+                      amount.count().alias("count"),
+                      *[amount.filter(pl.col("category") == col).sum().alias(f"{col} Total Value")
+                        for col in target_cols]) \
+                 .with_columns(pl.col("transactionDay").cast(pl.Int32))
+
+    @staticmethod
+    def day_grid(lf: pl.LazyFrame):
+        """
+        Returns every (accountId, transactionDay) pair between the first and last day, so that each account has a
+        rolling window result for days without transactions
+        """
+        accounts = lf.select(pl.col("accountId").unique())
+        days = lf.select(pl.int_range(pl.col("transactionDay").min(), pl.col("transactionDay").max() + 1,
+                                      dtype=pl.Int32).alias("transactionDay"))
+
+        return accounts.join(days, how="cross")
+
+
+if __name__ == '__main__':
+
+    DATA_PATH = "transactions.txt"
+    transac_analysis = TransactionsAnalysis(DATA_PATH)
+
+    # Aggregations saved to csv files, rounding to 2 decimal places
+    transac_analysis.get_daily_totals().write_csv("daily_totals_polars.csv", float_precision=2)
+    transac_analysis.get_average_by_category().write_csv("category_averages_polars.csv", float_precision=2)
+    transac_analysis.rolling_window(5).write_csv("rolling_time_window_polars.csv", float_precision=2)
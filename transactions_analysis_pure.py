@@ -1,267 +1,341 @@
-from collections import defaultdict
-import copy
 import csv
-from dataclasses import dataclass
-from operator import attrgetter
 
+from numba import guvectorize, int8, int64, njit
+import numpy as np
+import pandas as pd
 
-@dataclass
-class Transaction:
+# Column positions of the rolling window aggregation array, the target category totals follow from TARGET_TOTALS
+MAX = 0
+TOTAL = 1
+COUNT = 2
+TARGET_TOTALS = 3
+
+
+class Transactions:
     """
-    Data class that holds the transaction data variables
+    Column store (structure of arrays) of the transaction data, each attribute holds one element per transaction.
+    Account IDs and categories are encoded as integer codes that index into the account_vocab and category_vocab
+    string tables
     """
-    # Reduce memory usage of each class instance (also slightly faster attribute access)
-    __slots__ = ["transaction_id", "account_id", "transaction_day", "category", "transaction_amount"]
-    
-    transaction_id: str
-    account_id: str
-    transaction_day: int
-    category: str
-    transaction_amount: float
+    def __init__(self, account_ids, days, categories, amounts):
+        # Categorical codes are found by hashing the strings, columns that are already categorical are used as they are
+        account_categorical = pd.Categorical(account_ids)
+        category_categorical = pd.Categorical(categories)
+        
+        # Codes run from 0 to len - 1, which has to fit in int8
+        if len(category_categorical.categories) - 1 > np.iinfo(np.int8).max:
+            raise ValueError(f"Too many categories to encode: {len(category_categorical.categories)}")
+        # Missing values have a code of -1, which would index the last account or category
+        if (account_categorical.codes < 0).any() or (category_categorical.codes < 0).any():
+            raise ValueError("Transactions are missing an account ID or category")
+        
+        self.account_vocab = account_categorical.categories.to_numpy()
+        self.category_vocab = category_categorical.categories.to_numpy()
+        self.account_codes = account_categorical.codes.astype(np.int32)
+        self.day = np.asarray(days, dtype=np.uint16)
+        self.category_codes = category_categorical.codes.astype(np.int8)
+        # Amounts are stored as integer cents so that sums, and subtractions from sums, are exact
+        self.amount_cents = np.round(np.asarray(amounts, dtype=np.float64) * 100).astype(np.int64)
+        
+    @classmethod
+    def from_csv(cls, data_path: str):
+        """
+        Reads the transaction columns of a csv file into arrays with the pandas C parser, without creating per-row
+        objects. Account IDs and categories are parsed straight into categoricals, whose codes become the integer
+        codes. Transaction IDs are not used in the analysis so they are not read
+        """
+        df = pd.read_csv(data_path, engine="c",
+                         usecols=["accountId", "transactionDay", "category", "transactionAmount"],
+                         dtype={"accountId": "category",
+                                "transactionDay": np.uint16,
+                                "category": "category",
+                                "transactionAmount": np.float64})
+        
+        return cls(df["accountId"].array, df["transactionDay"].to_numpy(), df["category"].array,
+                   df["transactionAmount"].to_numpy())
 
-    def __post_init__(self):
-        # Force data class types
-        try:
-            self.transaction_amount = float(self.transaction_amount)
-            self.transaction_day = int(self.transaction_day)
-        except TypeError as error:
-            print(f"Failed to convert types of: {self.transaction_amount} {self.transaction_day} {error}")
 
-    def __lt__(self, other):
-        return self.transaction_day < other.transaction_day
-        
-    def __repr__(self):
-        return f"{self.__class__.__name__}({self.transaction_id!r}, {self.account_id!r}, {self.transaction_day}, " \
-            f"{self.category!r}, {self.transaction_amount})"
+@njit(cache=True)
+def totals_kernel(account_codes, days, category_codes, amounts, day_totals, day_counts, category_totals,
+                  category_counts):
+    """
+    Single pass over the transactions that sums the amounts and counts by day and by (account, category) together, so
+    each transaction is only loaded once for both aggregations
+    """
+    for index in range(len(days)):
+        amount = amounts[index]
+        day_totals[days[index]] += amount
+        day_counts[days[index]] += 1
+        category_totals[account_codes[index], category_codes[index]] += amount
+        category_counts[account_codes[index], category_codes[index]] += 1
+
+
+@njit(cache=True)
+def update_max(agg, amount):
+    """
+    Sets a new maximum value if transaction amount > previous maximum
+    """
+    if amount > agg[MAX]:
+        agg[MAX] = amount
+
+
+@njit(cache=True)
+def check_max_changed(agg, amount):
+    """
+    Returns whether the value being removed is the current maximum transaction amount
+    """
+    if amount == agg[MAX]:
+        agg[MAX] = 0
+        return True
+    else:
+        return False
+
+
+@njit(cache=True)
+def update_totals_add(agg, category, amount, target_columns):
+    """
+    Adds the transaction amount to its category total, if the category is a target category
+    """
+    column = target_columns[category]
+    if column >= 0:
+        agg[column] += amount
+
+
+@njit(cache=True)
+def update_totals_sub(agg, category, amount, target_columns):
+    """
+    Subtracts the transaction amount from its category total, if the category is a target category
+    """
+    column = target_columns[category]
+    if column >= 0:
+        agg[column] -= amount
+
+
+@njit(cache=True)
+def update_average_add(agg, amount):
+    """
+    Adds the transaction amount to the total and increments the count
+    """
+    agg[TOTAL] += amount
+    agg[COUNT] += 1
+
+
+@njit(cache=True)
+def update_average_sub(agg, amount):
+    """
+    Subtracts the transaction amount from the total and decrements the count
+    """
+    agg[TOTAL] -= amount
+    agg[COUNT] -= 1
+
+
+@guvectorize([(int64[:], int8[:], int64[:], int64[:], int64, int64[:, :])], "(m),(n),(n),(k),(),(d,c)",
+             target="parallel", writable_args=("agg_out",), cache=True)
+def roll_account(day_offsets, category_codes, amounts, target_columns, window_size, agg_out):
+    """
+    Sweeps one account's day sorted transactions once, keeping its rolling aggregation in agg and copying it into
+    agg_out[i] for each day i + window_size + 1 up to the last day. The account's transactions on day d are
+    category_codes/amounts[day_offsets[d]:day_offsets[d + 1]].
+    As a generalised ufunc, passing a [account code, day] day_offsets table and a [account code, day index, column]
+    agg_out broadcasts the sweep over the accounts, which are run in parallel as they are independent of each other.
+    The iteration takes advantage of the fact that in a rolling window, only the lower bound is removed from the
+    window between iterations and the values between the lower bound and the upper bound remain the same:
+    ----------------------------------------
+    Example:
+    window(n-1)  1, [2, 3, 4, 5, 6], 7, 8...
+    window(n)    1, 2, [3, 4, 5, 6, 7], 8...
     
+    Values 3,4,5,6 remain inside the window and are unchanged. The lower bound of 2 is removed and a new upper
+    bound is added into the window.
+    ----------------------------------------
+    Transactions between the previous lower bound and the current lower bound are "subtracted" from the aggregation,
+    then the transactions between the previous upper bound and the current upper bound are added.
+    Maximums can't be subtracted, so if the removed transactions included the maximum, it is re-aggregated over the
+    unchanged part of the window before adding the new transactions.
+    
+    @param target_columns: agg_out column of each category code's total, -1 for categories that are not totalled
+    """
+    agg = np.zeros(agg_out.shape[1], dtype=agg_out.dtype)
+    # Both bounds start at the first window's start day (day_index 0 gives window_start_day 1), so transactions
+    # before the first window are never added or subtracted
+    lower_bound = day_offsets[1]
+    upper_bound = day_offsets[1]
+    
+    for day_index in range(agg_out.shape[0]):
+        # Window of [window_start_day, window_end_day)
+        window_end_day = window_size + 1 + day_index
+        window_start_day = window_end_day - window_size
+        new_lower_bound = day_offsets[window_start_day]
+        new_upper_bound = day_offsets[window_end_day]
+        # Was the maximum value changed in the out-of-bounds window removal
+        max_changed = False
+        
+        for index in range(lower_bound, new_lower_bound):
+            amount = amounts[index]
+            # "|=" bitwise "or" operator used so that once max_changed is True, it will remain True
+            max_changed |= check_max_changed(agg, amount)
+            # Subtract the totals and counts from the out of bounds transactions
+            update_totals_sub(agg, category_codes[index], amount, target_columns)
+            update_average_sub(agg, amount)
+        
+        if max_changed:
+            for index in range(new_lower_bound, upper_bound):
+                update_max(agg, amounts[index])
+        
+        for index in range(upper_bound, new_upper_bound):
+            amount = amounts[index]
+            update_max(agg, amount)
+            update_totals_add(agg, category_codes[index], amount, target_columns)
+            update_average_add(agg, amount)
+        
+        lower_bound = new_lower_bound
+        upper_bound = new_upper_bound
+        agg_out[day_index] = agg
+
 
 class TransactionListAnalysis:
     """
-    Analysis class with aggregation methods that operate on the List[Transaction]
+    Analysis class with aggregation methods that operate on the Transactions columns
     """
-    def __init__(self, transactions: list):
+    def __init__(self, transactions: Transactions):
         self.transactions = transactions
         self.unique_categories = self.get_unique_categories()
-        # Rolling window aggregation variables
-        self.rolling_aggregation = None
-        self.lower_bound = 0
-        self.upper_bound = 0
+
+    def get_totals(self) -> tuple:
+        """
+        Accumulates the daily totals and the (account, category) totals together in one pass over the transactions
+        Returns: Day totals and counts indexed by day, category totals and counts indexed by [account code, category],
+        totals are in cents
+        """
+        day_totals = np.zeros(int(self.transactions.day.max()) + 1, dtype=np.int64)
+        day_counts = np.zeros(len(day_totals), dtype=np.int64)
+        grid_shape = (len(self.transactions.account_vocab), len(self.transactions.category_vocab))
+        category_totals = np.zeros(grid_shape, dtype=np.int64)
+        category_counts = np.zeros(grid_shape, dtype=np.int64)
+        
+        totals_kernel(self.transactions.account_codes, self.transactions.day, self.transactions.category_codes,
+                      self.transactions.amount_cents, day_totals, day_counts, category_totals, category_counts)
+        
+        return day_totals, day_counts, category_totals, category_counts
+    
+    def compute_all(self, window_size: int = 5, target_total_cols: list = None) -> dict:
+        """
+        Computes every aggregation, the daily totals and category averages share a single pass over the transactions
+        Returns: Dictionary of the daily totals, category averages and rolling time window outputs
+        """
+        day_totals, day_counts, category_totals, category_counts = self.get_totals()
+        
+        return {"daily_totals": self.get_daily_totals_dict(day_totals, day_counts),
+                "category_averages": self.get_category_averages_dict(category_totals, category_counts),
+                "rolling_time_window": self.get_rolling_time_window(window_size, target_total_cols)}
 
     def get_daily_totals(self) -> dict:
         """
         Returns: Dictionary of the total transaction amounts (value) by day (key)
         """
-        day_totals = defaultdict(int)
+        # Totals and counts indexed by day number, each summed in a single pass by bincount. bincount sums float
+        # weights, which are exact for sums of cents well beyond any realistic total, so they are cast back to int64.
+        # The weights are converted up front, as bincount's own conversion of int64 weights is much slower
+        weights = self.transactions.amount_cents.astype(np.float64)
+        day_totals = np.bincount(self.transactions.day, weights=weights).astype(np.int64)
+        day_counts = np.bincount(self.transactions.day)
     
-        for transaction in self.transactions:
-            day_totals[transaction.transaction_day] += transaction.transaction_amount
+        return self.get_daily_totals_dict(day_totals, day_counts)
     
-        return day_totals
+    @staticmethod
+    def get_daily_totals_dict(day_totals: np.ndarray, day_counts: np.ndarray) -> dict:
+        """
+        Returns: Dictionary of the total transaction amounts (value) by day (key) from the day total and count arrays
+        """
+        # Counts are used to find the days present as a day's total could be 0
+        return {day: day_totals[day] / 100 for day in np.flatnonzero(day_counts).tolist()}
         
     def get_unique_categories(self) -> set:
         """
-        Returns: Set of the unique categories that exist in the transactions list
+        Returns: Set of the unique categories that exist in the transactions
         """
-        unique_categories = set()
-        
-        for transaction in self.transactions:
-            unique_categories.add(transaction.category)
-        
-        return unique_categories
-        
+        return set(self.transactions.category_vocab.tolist())
+    
     def get_average_by_category(self) -> dict:
         """
-        Nested dictionary, each key is an Account ID, and each ID contains a dictionary of category totals and counts
-        Returns: Dictionary of category totals and counts by account_id
+        Nested dictionary, each key is an Account ID, and each ID contains a dictionary of category averages
+        Returns: Dictionary of category averages by account_id
         """
-        # Compute totals and counts while iterating over transactions
-        category_totals = defaultdict(lambda: {cat: {"total": 0, "count": 0} for cat in self.unique_categories})
+        grid_shape = (len(self.transactions.account_vocab), len(self.transactions.category_vocab))
+        # Flat (account, category) grid index of each transaction, so the grid is summed by a single bincount
+        grid_index = self.transactions.account_codes.astype(np.int64) * grid_shape[1] + self.transactions.category_codes
+        # Float weights and int64 cast back as in get_daily_totals()
+        category_totals = np.bincount(grid_index, weights=self.transactions.amount_cents.astype(np.float64),
+                                      minlength=grid_shape[0] * grid_shape[1]).astype(np.int64).reshape(grid_shape)
+        category_counts = np.bincount(grid_index, minlength=grid_shape[0] * grid_shape[1]).reshape(grid_shape)
         
-        for transaction in self.transactions:
-            category_totals[transaction.account_id][transaction.category]["total"] += transaction.transaction_amount
-            category_totals[transaction.account_id][transaction.category]["count"] += 1
-            
-        # Compute averages based on the totals and counts calculated above
-
-        category_averages = defaultdict(lambda: {cat: 0 for cat in self.unique_categories})
-
-        for account_id, category_dict in category_totals.items():
-            for unique_category in self.unique_categories:
-                total_count_dict = category_dict.get(unique_category, {})
-                total = total_count_dict.get("total", 0)
-                count = total_count_dict.get("count", 0)
+        return self.get_category_averages_dict(category_totals, category_counts)
+    
+    def get_category_averages_dict(self, category_totals: np.ndarray, category_counts: np.ndarray) -> dict:
+        """
+        Returns: Dictionary of category averages by account_id from the (account, category) total and count grids
+        """
+        # Categories without transactions have an average of 0, the / 100 converts cents back to the amount
+        averages = np.divide(category_totals, category_counts * 100, out=np.zeros(category_totals.shape),
+                             where=category_counts > 0)
         
-                try:
-                    average = total / count
-                except ZeroDivisionError:
-                    average = 0
-                    
-                category_averages[account_id][unique_category] = average
+        categories = self.transactions.category_vocab.tolist()
+        category_averages = {account_id: dict(zip(categories, account_averages))
+                             for account_id, account_averages in zip(self.transactions.account_vocab.tolist(),
+                                                                     averages.tolist())}
         
         return category_averages
         
-    @staticmethod
-    def create_window_default_keys(target_cols: list) -> dict:
-        """
-        Creates the dictionary that will be used in defaultdict for each Account ID
-        e.g. >> {"max": 0, "total": 0, "count": 0, "AA": 0, "CC": 0, "FF": 0}
-        where AA, CC, FF are @param target_cols
-        Returns: Template dictionary that wil be used in defaultdict
-        """
-        default_keys = {"max": 0, "total": 0, "count": 0}
-    
-        for col in target_cols:
-            default_keys[col] = 0
-    
-        return default_keys
-    
     def get_rolling_time_window(self, window_size: int = 5, target_total_cols: list = None):
         """
-        Performs aggregations over a rolling time window of window_size width. Data is stored in an output dict between
-        iterations to return
-        Note: Data must be sorted by transaction.transaction_day
-        For all days between window_size and end_day:
-        {day_num: {account_n: {max: w, total: x, count: y, category_n: z}}}
-        e.g. >> {6: {'A1': {'max': 977.98, 'total': 1376.81, 'count': 3, 'AA': 0, 'CC': 171.19, 'FF': 977.98}}}
-        Returns: Aggregate output of all rolling time period aggregations
+        Performs aggregations over a rolling time window of window_size width. The aggregation of every account is
+        stored in an output array for each day between window_size and end_day
+        [day - window_size - 1, account code, MAX/TOTAL/COUNT/TARGET_TOTALS...]
+        e.g. >> rolling_aggregation[0, 0] == [97798, 137681, 3, 0, 17119, 97798] for day 6 and account 'A1'
+        Returns: Aggregate output array of all rolling time period aggregations, amounts are in cents
         """
         if target_total_cols is None:
             target_total_cols = ["AA", "CC", "FF"]
         
-        # Sort the transactions by day in ascending order, necessary for iterate_window_range()
-        self.transactions.sort(key=attrgetter("transaction_day"))
-
         # +1 to exclude current day
         window_start = window_size + 1
-        # List was sorted above so the last item will have the largest day
-        window_end = self.transactions[-1].transaction_day
+        window_end = int(self.transactions.day.max())
 
         if (window_size > window_end) or window_size < 2:
             raise ValueError(f"Invalid window size given: {window_size}")
         
-        # Uses a default dict for each Account ID access using the template created in create_window_default_keys()
-        self.rolling_aggregation = defaultdict(lambda: self.create_window_default_keys(target_total_cols))
-        # Outputs need temporary storage to save to file at the end of the window
-        aggregation_outputs = {}
-        
-        # +1 to include the window_end as well in range(start,end)
-        for num_day in range(window_start, window_end + 1):
-            # start day, end day, cols
-            self.iterate_window_range(num_day - window_size, num_day, target_total_cols)
-            aggregation_outputs[num_day] = copy.deepcopy(self.rolling_aggregation)
-        
-        return aggregation_outputs
-
-    def iterate_window_range(self, window_start_day: int, window_end_day: int, target_cols: list):
-        """
-        Performs efficient iteration over the defined window range.
-        The iteration procedure takes advantage of the fact that in a rolling window, only the lower bound is removed
-        from the window between iterations and the values between the lower bound and the upper bound remain the same:
-        ----------------------------------------
-        Example:
-        window(n-1)  1, [2, 3, 4, 5, 6], 7, 8...
-        window(n)    1, 2, [3, 4, 5, 6, 7], 8...
+        category_codes = {category: code for code, category in enumerate(self.transactions.category_vocab)}
+        # Lookup table from category code to its total column, so roll_account() finds a transaction's total column
+        # with one index instead of scanning the target categories. Target categories that are not in the data
+        # keep their zeroed column
+        target_columns = np.full(len(category_codes), -1, dtype=np.int64)
+        for target_index, col in enumerate(target_total_cols):
+            if col in category_codes:
+                target_columns[category_codes[col]] = TARGET_TOTALS + target_index
         
-        Values 3,4,5,6 remain inside the window and are unchanged. The lower bound of 2 is removed and a new upper
-        bound is added into the window.
-        ----------------------------------------
-        The transactions list is sliced using the previous lower bound as the start step. The previous lower bound is
-        the window_start_day of the previous iteration.
-        Any values between the previous lower bound and the current lower bound are "subtracted" from the aggregation.
-        Then the iteration skips to the previous upper bound (because the other values are unchanged as above) and
-        continues aggregating from there.
+        num_accounts = len(self.transactions.account_vocab)
+        # Snapshot of every account's aggregation for each day, one contiguous buffer that roll_account() writes in
+        # full, so it is not zeroed first. +1 to include the window_end as well
+        day_slices = np.empty((window_end + 1 - window_start, num_accounts, TARGET_TOTALS + len(target_total_cols)),
+                              dtype=np.int64)
         
-        @param window_start_day: Rolling transaction window start day (inclusive)
-        @param window_end_day: Rolling transaction window end day (not inclusive)
-        @param target_cols: Column names of categories to total
-        """
-        new_lower_bound = None
+        # Group the transactions by account and sort them by day within each account, necessary for roll_account()
+        order = np.lexsort((self.transactions.day, self.transactions.account_codes))
+        # Counting the transactions of each (account, day) in the same order gives the start offset of every
+        # (account, day) with one prefix sum, so no window bound has to be searched for
+        num_days = window_end + 1
+        day_counts = np.bincount(self.transactions.account_codes.astype(np.int64) * num_days + self.transactions.day,
+                                 minlength=num_accounts * num_days)
+        day_offsets = np.concatenate(([0], np.cumsum(day_counts)))
+        # Row a is account a's offsets for every day plus its end offset, consecutive rows share one element
+        account_day_offsets = np.lib.stride_tricks.sliding_window_view(day_offsets, num_days + 1)[::num_days]
         
-        current_index = 0
-        # Was the maximum value changed in the out-of-bounds window removal
-        max_changed = False
-        
-        # Base slice should be created outside of the loop because, even though the list slice is not duplicated in
-        # memory, the references _are_ copied and that can be expensive in larger datasets
-        transaction_slice = self.transactions[self.lower_bound:]
+        roll_account(account_day_offsets, self.transactions.category_codes[order],
+                     self.transactions.amount_cents[order], target_columns, window_size,
+                     day_slices.transpose(1, 0, 2))
         
-        # While loop used to allow iteration skips using current_index
-        while current_index + self.lower_bound < len(self.transactions):
-            
-            transaction = transaction_slice[current_index]
-            
-            # Between previous lower bound and new lower bound:
-            if transaction.transaction_day < window_start_day:
-                # "|=" bitwise "or" operator used so that once max_changed is True, it will remain True
-                max_changed |= self.check_max_changed(transaction)
-                # Subtract the totals and counts from the out of bounds transactions
-                self.update_totals(transaction, target_cols, SUBTRACTING)
-                self.update_average(transaction, SUBTRACTING)
-            # Between new lower bound and upper bound
-            elif window_end_day > transaction.transaction_day >= window_start_day:
-                # Set the new lower bound
-                if new_lower_bound is None:
-                    new_lower_bound = self.lower_bound + current_index
-                
-                # If maximum did not change, there is no need to re-aggregate the unchanged values, can skip the
-                # iteration to the upper bound index. Continue used to avoid index +1 at end of loop.
-                if (self.lower_bound + current_index < self.upper_bound) and not max_changed:
-                    current_index = self.upper_bound - self.lower_bound
-                    continue
-                else:
-                    # Compute aggregations
-                    self.update_max(transaction)
-                    self.update_totals(transaction, target_cols, ADDING)
-                    self.update_average(transaction, ADDING)
-            # Hit the end of the transaction window
-            elif transaction.transaction_day >= window_end_day:
-                break
-            
-            # For loop but with index skipping
-            current_index += 1
-
-        # Note: Set new upper bound first before changing lower bound
-        self.upper_bound = self.lower_bound + current_index
-        self.lower_bound = new_lower_bound
-        
-    def update_max(self, transaction: Transaction):
-        """
-        Sets a new maximum value if transaction amount > previous maximum
-        """
-        if transaction.transaction_amount > self.rolling_aggregation[transaction.account_id]["max"]:
-            self.rolling_aggregation[transaction.account_id]["max"] = transaction.transaction_amount
+        return day_slices
     
-    def check_max_changed(self, transaction: Transaction) -> bool:
-        """
-        Returns whether the value being removed is the current maximum transaction amount
-        """
-        if transaction.transaction_amount == self.rolling_aggregation[transaction.account_id]["max"]:
-            self.rolling_aggregation[transaction.account_id]["max"] = 0
-            return True
-        else:
-            return False
-    
-    def update_totals(self, transaction: Transaction, target_cols: list, operation: int):
-        """
-        Adds or subtracts the transaction amount (based on @param operation) from the account_id's category
-        """
-        if transaction.category in target_cols:
-            if operation == ADDING:
-                self.rolling_aggregation[transaction.account_id][transaction.category] += transaction.transaction_amount
-            elif operation == SUBTRACTING:
-                self.rolling_aggregation[transaction.account_id][transaction.category] -= transaction.transaction_amount
-
-    def update_average(self, transaction: Transaction, operation: int):
-        """
-        Adds or subtracts the transaction amount (based on @param operation) and increments the count for each id
-        """
-        if operation == ADDING:
-            self.rolling_aggregation[transaction.account_id]["total"] += transaction.transaction_amount
-            self.rolling_aggregation[transaction.account_id]["count"] += 1
-        elif operation == SUBTRACTING:
-            self.rolling_aggregation[transaction.account_id]["total"] -= transaction.transaction_amount
-            self.rolling_aggregation[transaction.account_id]["count"] -= 1
-        
     @staticmethod
     def save_daily_totals(filename: str, daily_totals: dict):
         """
@@ -293,52 +367,41 @@ class TransactionListAnalysis:
                 
                 csv_writer.writerow(csv_row)
     
-    @staticmethod
-    def save_rolling_aggregation(filename: str, rolling_aggregation: dict, target_cols: list):
+    def save_rolling_aggregation(self, filename: str, rolling_aggregation: np.ndarray, target_cols: list):
         """
-        Writes a csv file of [Account ID, AA Total, ... , XX Total] (header) for each unique category with
-        corresponding values per row
+        Writes a csv file of [Day, Account ID, Max Transaction, Mean Transaction, AA Total Value, ... ] (header) for
+        each target category with corresponding values per row
         """
-        with open(filename, "w", newline="") as csv_file:
-            csv_writer = csv.writer(csv_file, delimiter=',')
-            header = ["Day", "Account ID", "Max Transaction", "Mean Transaction"]
-            header += [category + " Total Value" for category in target_cols]
-            csv_writer.writerow(header)
-            
-            for day, rolling_obj in rolling_aggregation.items():
-                for account_id, aggregation_obj in rolling_obj.items():
-                    csv_row = [day, account_id, aggregation_obj["max"]]
-                    
-                    try:
-                        mean_average = "%.2f" % (aggregation_obj["total"] / aggregation_obj["count"])
-                    except ZeroDivisionError:
-                        mean_average = "0.0"
-                    csv_row.append(mean_average)
-                    
-                    for category in target_cols:
-                        csv_row.append("%.2f" % aggregation_obj[category])
-                    
-                    csv_writer.writerow(csv_row)
+        # The get_rolling_time_window() output array ends at the last day
+        window_end = int(self.transactions.day.max())
+        days = np.arange(window_end + 1 - len(rolling_aggregation), window_end + 1)
+        # One row per (day, account code), in the same order as the output array
+        rows = rolling_aggregation.reshape(-1, rolling_aggregation.shape[-1])
+        
+        # Cents converted back to amounts, accounts without transactions in the window have a mean of 0
+        df_rolling = pd.DataFrame({"Max Transaction": rows[:, MAX] / 100,
+                                   "Mean Transaction": np.divide(rows[:, TOTAL], rows[:, COUNT] * 100,
+                                                                 out=np.zeros(len(rows)), where=rows[:, COUNT] > 0),
+                                   **{f"{category} Total Value": rows[:, TARGET_TOTALS + target_index] / 100
+                                      for target_index, category in enumerate(target_cols)}},
+                                  index=pd.MultiIndex.from_product([days, self.transactions.account_vocab],
+                                                                   names=["Day", "Account ID"]))
+        
+        # An account is part of the output from the first window it has been in onwards
+        first_days = np.full(len(self.transactions.account_vocab), np.iinfo(np.int32).max)
+        np.minimum.at(first_days, self.transactions.account_codes, self.transactions.day)
+        in_output = np.tile(first_days, len(days)) < np.repeat(days, len(first_days))
+        
+        df_rolling[in_output].to_csv(filename, float_format="%.2f", lineterminator="\r\n")
 
             
 if __name__ == "__main__":
     DATA_PATH = "transactions.txt"
-    # Arbitrary operation constants used for aggregation addition/subtraction
-    SUBTRACTING = 0
-    ADDING = 1
     # Default category names to total in the rolling window aggregation
     TARGET_COLS = ["AA", "CC", "FF"]
     
-    transactions_list = []
-    
-    with open(DATA_PATH, "r") as data_file:
-        csv_reader = csv.reader(data_file)
-        next(csv_reader, None)
-        for row in csv_reader:
-            # *Unpack row values into Transaction() arguments
-            transactions_list.append(Transaction(*row))
-    
-    analysis = TransactionListAnalysis(transactions_list)
-    analysis.save_daily_totals("daily_totals.csv", analysis.get_daily_totals())
-    analysis.save_category_averages("category_averages.csv", analysis.get_average_by_category())
-    analysis.save_rolling_aggregation("rolling_time_window.csv", analysis.get_rolling_time_window(5), TARGET_COLS)
+    analysis = TransactionListAnalysis(Transactions.from_csv(DATA_PATH))
+    outputs = analysis.compute_all(5, TARGET_COLS)
+    analysis.save_daily_totals("daily_totals.csv", outputs["daily_totals"])
+    analysis.save_category_averages("category_averages.csv", outputs["category_averages"])
+    analysis.save_rolling_aggregation("rolling_time_window.csv", outputs["rolling_time_window"], TARGET_COLS)